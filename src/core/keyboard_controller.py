@@ -3,17 +3,107 @@ Keyboard Controller Module
 Handles keyboard input simulation for game control
 """
 
+import ctypes
+from ctypes import wintypes
+from collections import deque
 import math
 import pydirectinput
-from typing import Set
+from typing import Deque, Dict, List, Set, Tuple
 import threading
 import time
 
+# Win32 SendInput structures (winuser.h)
+INPUT_KEYBOARD = 1
+KEYEVENTF_EXTENDEDKEY = 0x0001
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_SCANCODE = 0x0008
+MAPVK_VK_TO_VSC_EX = 4
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ('wVk', wintypes.WORD),
+        ('wScan', wintypes.WORD),
+        ('dwFlags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.c_size_t),
+    ]
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ('dx', wintypes.LONG),
+        ('dy', wintypes.LONG),
+        ('mouseData', wintypes.DWORD),
+        ('dwFlags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.c_size_t),
+    ]
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [
+        ('uMsg', wintypes.DWORD),
+        ('wParamL', wintypes.WORD),
+        ('wParamH', wintypes.WORD),
+    ]
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [('ki', KEYBDINPUT), ('mi', MOUSEINPUT), ('hi', HARDWAREINPUT)]
+
+class INPUT(ctypes.Structure):
+    _anonymous_ = ('u',)
+    _fields_ = [('type', wintypes.DWORD), ('u', _INPUTUNION)]
+
+# Own user32 handle so the argtypes below don't leak into pydirectinput's calls
+_user32 = ctypes.WinDLL('user32')
+_SendInput = _user32.SendInput
+_SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int)
+_SendInput.restype = wintypes.UINT
+_MapVirtualKeyW = _user32.MapVirtualKeyW
+_MapVirtualKeyW.argtypes = (wintypes.UINT, wintypes.UINT)
+_MapVirtualKeyW.restype = wintypes.UINT
+_VkKeyScanW = _user32.VkKeyScanW
+_VkKeyScanW.argtypes = (wintypes.WCHAR,)
+_VkKeyScanW.restype = ctypes.c_short
+_INPUT_SIZE = ctypes.sizeof(INPUT)
+
+# Virtual-key codes for the named (non-character) keys offered in the GUI
+_NAMED_VK = {
+    'space': 0x20, 'shift': 0x10, 'ctrl': 0x11, 'alt': 0x12, 'tab': 0x09,
+    'capslock': 0x14, 'esc': 0x1B, 'enter': 0x0D, 'backspace': 0x08,
+    'delete': 0x2E, 'insert': 0x2D, 'home': 0x24, 'end': 0x23,
+    'pageup': 0x21, 'pagedown': 0x22,
+    'left': 0x25, 'up': 0x26, 'right': 0x27, 'down': 0x28,
+    **{f'f{i}': 0x6F + i for i in range(1, 13)},
+}
+
+def _scancode_for(key: str) -> int:
+    """Scancode for a key name, with 0xE0 in the high byte for extended keys (0 if unknown)"""
+    vk = _NAMED_VK.get(key)
+    if vk is None:
+        if len(key) != 1:
+            return 0
+        vk = _VkKeyScanW(key) & 0xFF
+        if vk == 0xFF:
+            return 0
+    return _MapVirtualKeyW(vk, MAPVK_VK_TO_VSC_EX)
+
+_TAN_PI_8 = math.tan(math.pi / 8)
+# Octant for index diagonal<<3 | (|y| > |x|)<<2 | (y >= 0)<<1 | (x >= 0), see _rebuild_octant_keys
+_OCTANT_INDEX = (
+    0, 4, 0, 4,  # Mostly horizontal: left / right
+    2, 2, 6, 6,  # Mostly vertical: backward / forward
+    1, 3, 7, 5,  # Diagonal, by quadrant
+    1, 3, 7, 5,
+)
+
 class KeyboardController:
     def __init__(self):
-        self.active_keys: Set[str] = set()
-        self.held_movement_keys: Set[str] = set()
-        self.held_action_keys: Set[str] = set()  # jump, crouch, sprint
+        # Pressed keys as bitmasks over _key_bits; active_keys etc. expose them as sets
+        self._active_mask = 0
+        self._held_movement_mask = 0
+        self._held_action_mask = 0  # jump, crouch, sprint
+        self._key_bits: Dict[str, int] = {}
+        self._key_names: List[str] = []  # Key name per bit position
+        self._lock = threading.Lock()  # Guards the masks against the prone timer thread
         self.movement_keys = {
             'forward': 'w',
             'backward': 's',
@@ -28,145 +118,251 @@ class KeyboardController:
         self.jump_threshold = 0.5
         self.crouch_threshold = 0.5
         self.sprint_threshold = 0.9
+        self._sprint_threshold_sq = self.sprint_threshold**2
         self.sprint_enabled = True
         self.prone_duration = 0.8  # in seconds
+        self._prone_duration_ns = int(self.prone_duration * 1e9)
         self.prone_active = False
         self.prone_timer = None
+        self._crouch_state = 'idle'  # idle, holding or prone
+        self._crouch_start_ns = 0
         self.button_keys = ['1', '2']
         self.button_states = [False, False]
+        self._button_state_mask = 0  # Bit i set while button i is pressed
+        # (octant, sprint, jump, crouch) of the last handled update, None forces a dispatch
+        self._last_dispatch = (-1, False, False, False)
+        # Key events queued by _hold_*/_release_* as (key, is_up), sent by _flush_keys
+        self._pending_keys: Deque[Tuple[str, bool]] = deque()
+        self._scancode_cache: Dict[str, int] = {}
+        # Prebuilt key down/up INPUT structs per key, filled by _cache_key
+        self._input_down: Dict[str, INPUT] = {}
+        self._input_up: Dict[str, INPUT] = {}
+        self._rebuild_octant_keys()
+        self._rebuild_scancode_cache()
 
     def update_movement(self, x: float, y: float, z: float):
-        magnitude = (x**2 + y**2)**0.5
-        # Movement keys
-        if abs(x) < self.movement_threshold and abs(y) < self.movement_threshold:
-            for key in ['forward', 'backward', 'left', 'right']:
-                self._release_movement(self.movement_keys[key])
+        magnitude_sq = x*x + y*y
+        ax = abs(x)
+        ay = abs(y)
+        if ax < self.movement_threshold and ay < self.movement_threshold:
+            octant = -1
         else:
-            angle = math.atan2(y, x)
-            directions = []
-            if -math.pi/8 <= angle < math.pi/8:
-                directions.append('right')
-            if math.pi/8 <= angle < 3*math.pi/8:
-                directions.extend(['right', 'forward'])
-            if 3*math.pi/8 <= angle < 5*math.pi/8:
-                directions.append('forward')
-            if 5*math.pi/8 <= angle < 7*math.pi/8:
-                directions.extend(['left', 'forward'])
-            if angle >= 7*math.pi/8 or angle < -7*math.pi/8:
-                directions.append('left')
-            if -7*math.pi/8 <= angle < -5*math.pi/8:
-                directions.extend(['left', 'backward'])
-            if -5*math.pi/8 <= angle < -3*math.pi/8:
-                directions.append('backward')
-            if -3*math.pi/8 <= angle < -math.pi/8:
-                directions.extend(['right', 'backward'])
-            for key in ['forward', 'backward', 'left', 'right']:
-                if key not in directions:
-                    self._release_movement(self.movement_keys[key])
-            for key in directions:
-                self._hold_movement(self.movement_keys[key])
+            # Octants are pi/4 wide and centred on the axes: the stick is diagonal
+            # when it is more than pi/8 away from both axes
+            diagonal = ay > ax * _TAN_PI_8 and ax > ay * _TAN_PI_8
+            octant = _OCTANT_INDEX[diagonal << 3 | (ay > ax) << 2 | (y >= 0) << 1 | (x >= 0)]
+        sprint = self.sprint_enabled and magnitude_sq > self._sprint_threshold_sq
+        jump = z > self.jump_threshold
+        crouch = z < -self.crouch_threshold
+        # Nothing crossed a threshold since the last call: all keys are already right
+        dispatch = (octant, sprint, jump, crouch)
+        if dispatch == self._last_dispatch:
+            if self._crouch_state == 'holding':
+                with self._lock:
+                    self._handle_crouch_prone(z)
+                    self._flush_keys()
+            return
+        self._last_dispatch = dispatch
+        with self._lock:
+            self._dispatch_movement(octant, sprint, jump, z)
+
+    def _dispatch_movement(self, octant: int, sprint: bool, jump: bool, z: float):
+        # Movement keys: only touch the keys whose bit differs from what is held
+        desired = self._octant_masks[octant] if octant >= 0 else 0
+        changed = self._held_movement_mask ^ desired
+        while changed:
+            bit = changed & -changed
+            changed ^= bit
+            key = self._key_names[bit.bit_length() - 1]
+            if desired & bit:
+                self._hold_movement(key)
+            else:
+                self._release_movement(key)
         # Sprint
-        if self.sprint_enabled and magnitude > self.sprint_threshold:
+        if sprint:
             self._hold_action(self.sprint_key)
         else:
             self._release_action(self.sprint_key)
         # Jump
-        if z > self.jump_threshold:
+        if jump:
             self._hold_action(self.jump_key)
         else:
             self._release_action(self.jump_key)
         # Crouch/Prone logic
         self._handle_crouch_prone(z)
+        self._flush_keys()
 
     def _handle_crouch_prone(self, z):
-        prone_time = self.prone_duration
-        crouch_key = self.crouch_key
-        prone_key = self.prone_key
-        if not hasattr(self, '_crouch_prone_thread'):
-            self._crouch_prone_thread = None
-        if z < -self.crouch_threshold:
-            if self._crouch_prone_thread is None or not self._crouch_prone_thread.is_alive():
-                def crouch_or_prone_worker():
-                    start = time.time()
-                    while True:
-                        elapsed = time.time() - start
-                        # Check if threshold is still held
-                        if self._last_z is not None and self._last_z >= -self.crouch_threshold:
-                            # Released before prone_time: do crouch for held time
-                            pydirectinput.keyDown(crouch_key)
-                            self.active_keys.add(crouch_key)
-                            self.held_action_keys.add(crouch_key)
-                            time.sleep(elapsed)
-                            pydirectinput.keyUp(crouch_key)
-                            self.active_keys.discard(crouch_key)
-                            self.held_action_keys.discard(crouch_key)
-                            return
-                        if elapsed >= prone_time:
-                            # Held long enough: do prone only
-                            pydirectinput.keyDown(prone_key)
-                            self.active_keys.add(prone_key)
-                            self.held_action_keys.add(prone_key)
-                            time.sleep(prone_time)
-                            pydirectinput.keyUp(prone_key)
-                            self.active_keys.discard(prone_key)
-                            self.held_action_keys.discard(prone_key)
-                            return
-                        time.sleep(0.01)
-                self._last_z = z
-                def z_updater():
-                    while True:
-                        self._last_z = self._current_z
-                        time.sleep(0.01)
-                self._current_z = z
-                self._z_updater_thread = threading.Thread(target=z_updater)
-                self._z_updater_thread.daemon = True
-                self._z_updater_thread.start()
-                self._crouch_prone_thread = threading.Thread(target=crouch_or_prone_worker)
-                self._crouch_prone_thread.daemon = True
-                self._crouch_prone_thread.start()
-            else:
-                self._current_z = z
-        else:
-            self._current_z = z
-            self._release_action(crouch_key)
+        # Ticked on every update: idle -> holding (crouch down) -> prone after prone_duration
+        crouched = z < -self.crouch_threshold
+        if self._crouch_state == 'idle':
+            if crouched:
+                self._hold_action(self.crouch_key)
+                self._crouch_state = 'holding'
+                self._crouch_start_ns = time.monotonic_ns()
+        elif not crouched:
+            # Released before prone kicked in, or back up after going prone
+            self._release_action(self.crouch_key)
+            self._crouch_state = 'idle'
+        elif self._crouch_state == 'holding' and time.monotonic_ns() - self._crouch_start_ns >= self._prone_duration_ns:
+            # Held long enough: swap crouch for a timed prone press
+            self._release_action(self.crouch_key)
+            self._hold_action(self.prone_key)
+            self.prone_active = True
+            self._crouch_state = 'prone'
+            self.prone_timer = threading.Timer(self.prone_duration, self._release_prone, args=(self.prone_key,))
+            self.prone_timer.daemon = True
+            self.prone_timer.start()
+
+    def _release_prone(self, key: str):
+        with self._lock:
+            self._release_action(key)
+            self.prone_active = False
+            self._flush_keys()
 
     def _hold_movement(self, key: str):
-        if key not in self.held_movement_keys:
-            pydirectinput.keyDown(key)
-            self.held_movement_keys.add(key)
-            self.active_keys.add(key)
+        bit = self._key_bit(key)
+        if not self._held_movement_mask & bit:
+            self._pending_keys.append((key, False))
+            self._held_movement_mask |= bit
+            self._active_mask |= bit
     def _release_movement(self, key: str):
-        if key in self.held_movement_keys:
-            pydirectinput.keyUp(key)
-            self.held_movement_keys.remove(key)
-            self.active_keys.discard(key)
+        bit = self._key_bit(key)
+        if self._held_movement_mask & bit:
+            self._pending_keys.append((key, True))
+            self._held_movement_mask &= ~bit
+            self._active_mask &= ~bit
     def _hold_action(self, key: str):
-        if key not in self.held_action_keys:
-            pydirectinput.keyDown(key)
-            self.held_action_keys.add(key)
-            self.active_keys.add(key)
+        bit = self._key_bit(key)
+        if not self._held_action_mask & bit:
+            self._pending_keys.append((key, False))
+            self._held_action_mask |= bit
+            self._active_mask |= bit
     def _release_action(self, key: str):
-        if key in self.held_action_keys:
-            pydirectinput.keyUp(key)
-            self.held_action_keys.remove(key)
-            self.active_keys.discard(key)
+        bit = self._key_bit(key)
+        if self._held_action_mask & bit:
+            self._pending_keys.append((key, True))
+            self._held_action_mask &= ~bit
+            self._active_mask &= ~bit
+
+    def _key_bit(self, key: str) -> int:
+        bit = self._key_bits.get(key)
+        if bit is None:
+            # Key was assigned without going through a setter
+            self._cache_key(key)
+            bit = self._key_bits[key]
+        return bit
+
+    def _keys_in(self, mask: int) -> Set[str]:
+        keys = set()
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            keys.add(self._key_names[bit.bit_length() - 1])
+        return keys
+
+    @property
+    def active_keys(self) -> Set[str]:
+        return self._keys_in(self._active_mask)
+    @property
+    def held_movement_keys(self) -> Set[str]:
+        return self._keys_in(self._held_movement_mask)
+    @property
+    def held_action_keys(self) -> Set[str]:
+        return self._keys_in(self._held_action_mask)
+
+    def _flush_keys(self):
+        # Send every queued key event in one SendInput call
+        pending = self._pending_keys
+        if not pending:
+            return
+        events = []
+        while pending:
+            key, up = pending.popleft()
+            if key not in self._scancode_cache:
+                # Key was assigned without going through a setter
+                self._cache_key(key)
+            event = (self._input_up if up else self._input_down).get(key)
+            if event is None:
+                # Not resolvable to a scancode here, let pydirectinput deal with it
+                (pydirectinput.keyUp if up else pydirectinput.keyDown)(key)
+                continue
+            events.append(event)
+        if len(events) == 1:
+            _SendInput(1, ctypes.byref(events[0]), _INPUT_SIZE)
+        elif events:
+            _SendInput(len(events), (INPUT * len(events))(*events), _INPUT_SIZE)
+
+    def _cache_key(self, key: str):
+        if key not in self._key_bits:
+            self._key_bits[key] = 1 << len(self._key_names)
+            self._key_names.append(key)
+        scancode = self._scancode_cache[key] = _scancode_for(key)
+        if scancode:
+            flags = KEYEVENTF_SCANCODE
+            if scancode > 0xFF:
+                flags |= KEYEVENTF_EXTENDEDKEY
+            self._input_down[key] = INPUT(type=INPUT_KEYBOARD, ki=KEYBDINPUT(0, scancode & 0xFF, flags, 0, 0))
+            self._input_up[key] = INPUT(type=INPUT_KEYBOARD, ki=KEYBDINPUT(0, scancode & 0xFF, flags | KEYEVENTF_KEYUP, 0, 0))
+
+    def _rebuild_scancode_cache(self):
+        # Resolve every configured key up front so _flush_keys only does dict lookups
+        keys = {
+            *self.movement_keys.values(), *self.button_keys,
+            self.jump_key, self.crouch_key, self.sprint_key, self.prone_key,
+        }
+        for key in keys:
+            if key not in self._scancode_cache:
+                self._cache_key(key)
 
     def release_all_keys(self):
-        for key in list(self.active_keys):
-            pydirectinput.keyUp(key)
-        self.active_keys.clear()
-        self.held_movement_keys.clear()
-        self.held_action_keys.clear()
+        if self.prone_timer is not None:
+            self.prone_timer.cancel()
+        with self._lock:
+            self.prone_active = False
+            self._crouch_state = 'idle'
+            for key in self._keys_in(self._active_mask):
+                self._pending_keys.append((key, True))
+            self._flush_keys()
+            self._active_mask = 0
+            self._held_movement_mask = 0
+            self._held_action_mask = 0
+            self._last_dispatch = (-1, False, False, False)
 
     def set_movement_key(self, action: str, key: str):
         if action in self.movement_keys:
             self.movement_keys[action] = key.lower()
+            self._rebuild_octant_keys()
+            self._rebuild_scancode_cache()
+            self._last_dispatch = None
+    def _rebuild_octant_keys(self):
+        # Key bitmask to hold per octant, counter-clockwise starting at angle -pi
+        left = self._key_bit(self.movement_keys['left'])
+        right = self._key_bit(self.movement_keys['right'])
+        forward = self._key_bit(self.movement_keys['forward'])
+        backward = self._key_bit(self.movement_keys['backward'])
+        self._octant_masks = (
+            left,
+            left | backward,
+            backward,
+            right | backward,
+            right,
+            right | forward,
+            forward,
+            left | forward,
+        )
     def set_jump_key(self, key: str):
         self.jump_key = key.lower()
+        self._rebuild_scancode_cache()
+        self._last_dispatch = None
     def set_crouch_key(self, key: str):
         self.crouch_key = key.lower()
+        self._rebuild_scancode_cache()
+        self._last_dispatch = None
     def set_sprint_key(self, key: str):
         self.sprint_key = key.lower()
+        self._rebuild_scancode_cache()
+        self._last_dispatch = None
     def set_movement_threshold(self, value: float):
         self.movement_threshold = max(0.0, min(1.0, value))
     def set_jump_threshold(self, value: float):
@@ -175,38 +371,60 @@ class KeyboardController:
         self.crouch_threshold = max(0.0, min(1.0, value))
     def set_sprint_threshold(self, value: float):
         self.sprint_threshold = max(0.0, min(1.0, value))
+        self._sprint_threshold_sq = self.sprint_threshold**2
     def set_sprint_enabled(self, enabled: bool):
         self.sprint_enabled = enabled
     def update_buttons(self, buttons: list):
-        n = max(len(self.button_keys), len(self.button_states), len(buttons))
-        while len(self.button_keys) < n:
-            self.button_keys.append('1')
-        while len(self.button_states) < n:
-            self.button_states.append(False)
-        for i in range(n):
-            pressed = (buttons[i] == 1) if i < len(buttons) else False
+        new_mask = 0
+        for i, pressed in enumerate(buttons):
+            if pressed == 1:
+                new_mask |= 1 << i
+        # Only visit the buttons whose bit flipped since the last update
+        changed = new_mask ^ self._button_state_mask
+        self._button_state_mask = new_mask
+        if not changed:
+            return
+        with self._lock:
+            self._update_button_keys(new_mask, changed)
+
+    def _update_button_keys(self, new_mask: int, changed: int):
+        while changed:
+            bit = changed & -changed
+            changed ^= bit
+            i = bit.bit_length() - 1
+            while len(self.button_keys) <= i:
+                self.button_keys.append('1')
+            while len(self.button_states) <= i:
+                self.button_states.append(False)
             key = self.button_keys[i]
-            if pressed != self.button_states[i]:
-                if pressed and not self.button_states[i]:
-                    pydirectinput.press(key)
-                    self.active_keys.add(key)
-                elif not pressed and self.button_states[i]:
-                    pydirectinput.keyUp(key)
-                    if key in self.active_keys:
-                        self.active_keys.remove(key)
+            pressed = bool(new_mask & bit)
+            # Hold the key for as long as the button is down, like a real key press
+            self._pending_keys.append((key, not pressed))
+            if pressed:
+                self._active_mask |= self._key_bit(key)
+            else:
+                self._active_mask &= ~self._key_bit(key)
             self.button_states[i] = pressed
+        self._flush_keys()
     def set_button_key(self, index: int, key: str):
         while len(self.button_keys) <= index:
             self.button_keys.append(str(index+1))
         self.button_keys[index] = key.lower()
+        self._rebuild_scancode_cache()
     def set_prone_key(self, key: str):
         self.prone_key = key.lower()
+        self._rebuild_scancode_cache()
     def set_prone_duration(self, seconds: float):
         self.prone_duration = max(0.05, float(seconds))
+        self._prone_duration_ns = int(self.prone_duration * 1e9)
     @property
     def active_actions(self):
         return {
             'movement': list(self.held_movement_keys),
             'actions': list(self.held_action_keys),
             'buttons': [self.button_keys[i] for i, pressed in enumerate(self.button_states) if pressed],
-        } 
\ No newline at end of file
+        }
+    @property
+    def active_state(self) -> Tuple[int, bool]:
+        # Cheap marker that changes whenever active_actions or prone_active does
+        return (self._active_mask, self.prone_active)
@@ -3,34 +3,107 @@ SpaceMouse Controller Module
 Handles all SpaceMouse input and processing
 """
 
+import array
+import errno
+import math
+import os
 import pyspacemouse
 from typing import Tuple, Optional, List
+import sys
 import threading
 import time
 import logging
 
+try:
+    # Raised by the HID backend of pyspacemouse when a read fails
+    from easyhid import HIDException
+except ImportError:
+    HIDException = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+HID_REPORT_SIZE = 64
+READ_TIMEOUT_MS = 10  # Max time a read blocks waiting for a HID report
+MAX_DRAIN_REPORTS = 32  # Upper bound on queued reports consumed per loop iteration
+DEVICE_CACHE_TTL = 2.0  # Seconds a HID device enumeration is reused
+
+# Win32 thread priority levels accepted by set_thread_priority
+THREAD_PRIORITY_NORMAL = 0
+THREAD_PRIORITY_ABOVE_NORMAL = 1
+THREAD_PRIORITY_HIGHEST = 2
+THREAD_PRIORITY_TIME_CRITICAL = 15
+INPUT_THREAD_AFFINITY = 0x2  # Pin the input thread to CPU 1
+
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+
+    _THREAD_SET_INFORMATION = 0x0020
+    _THREAD_QUERY_INFORMATION = 0x0040
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _kernel32.OpenThread.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    _kernel32.OpenThread.restype = wintypes.HANDLE
+    _kernel32.SetThreadPriority.argtypes = (wintypes.HANDLE, ctypes.c_int)
+    _kernel32.SetThreadPriority.restype = wintypes.BOOL
+    _kernel32.SetThreadAffinityMask.argtypes = (wintypes.HANDLE, ctypes.c_size_t)
+    _kernel32.SetThreadAffinityMask.restype = ctypes.c_size_t
+    _kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    _kernel32.CloseHandle.restype = wintypes.BOOL
+else:
+    _kernel32 = None
+
+ERROR_DEVICE_NOT_CONNECTED = 1167
+
+def _is_disconnect_error(error: Exception) -> bool:
+    """
+    Check whether a read error means the device is gone
+    
+    Args:
+        error: Exception raised while reading from the device
+    
+    Returns:
+        bool: True if the device was unplugged or closed
+    """
+    if HIDException is not None and isinstance(error, HIDException):
+        return True
+    if isinstance(error, OSError):
+        return error.errno == errno.ENODEV or getattr(error, 'winerror', None) == ERROR_DEVICE_NOT_CONNECTED
+    return False
+
 class SpaceMouseController:
     def __init__(self):
         """
         Initialize the SpaceMouse controller
         """
         self.connected = False
-        self.running = False
+        # Stop event of the current input thread; every thread gets its own so a
+        # thread that is still winding down is never revived by the next one
+        self._stop = threading.Event()
+        self._stop.set()
         self.thread = None
+        self._conn_lock = threading.RLock()  # Serializes connect/disconnect with the in-thread reconnect
         self.callback = None
         self.on_disconnect = None
         self.device = None
+        self._device_spec = None  # Device object returned by pyspacemouse.open()
+        self._hid_device = None  # Its HID handle, if it can be read directly
+        self.thread_priority = THREAD_PRIORITY_TIME_CRITICAL
+        self._device_cache = None  # Last list_unique_devices() result
+        self._device_cache_ts = 0.0
         
         # Movement thresholds
         self.deadzone = 0.1
         self.sensitivity = 1.0
         
-        # Current state
-        self.current_state = {
+        # Current state: x, y, z, roll, pitch, yaw written in place by the input thread.
+        # _state_gen is odd while a write is in progress (seqlock), readers retry on a change.
+        self._state_buf = array.array('d', [0.0] * 6)
+        self._buttons_buf = []
+        self._state_gen = 0
+        # Reused for every callback invocation instead of allocating a dict per report
+        self._payload = {
             'x': 0.0,
             'y': 0.0,
             'z': 0.0,
@@ -54,12 +127,19 @@ class SpaceMouseController:
             logger.error(f"Error listing devices: {e}")
             return []
 
-    def list_unique_devices(self) -> List[str]:
+    def list_unique_devices(self, refresh: bool = False) -> List[str]:
         """
         List unique SpaceMouse device names (to avoid duplicate dongle entries)
+        
+        Enumerating HID devices is slow, so the result is reused for DEVICE_CACHE_TTL seconds.
+        Args:
+            refresh (bool): Enumerate again even if a cached result is available
         Returns:
             List[str]: List of unique device names
         """
+        now = time.monotonic()
+        if not refresh and self._device_cache is not None and now - self._device_cache_ts < DEVICE_CACHE_TTL:
+            return list(self._device_cache)
         try:
             devices = self.list_devices()
             # Only keep unique names
@@ -67,136 +147,278 @@ class SpaceMouseController:
             for d in devices:
                 if d not in unique:
                     unique.append(d)
-            return unique
+            self._device_cache = unique
+            self._device_cache_ts = now
+            return list(unique)
         except Exception as e:
             logger.error(f"Error listing unique devices: {e}")
             return []
 
+    def invalidate_device_cache(self):
+        """
+        Force the next list_unique_devices() call to enumerate the HID devices again
+        """
+        self._device_cache = None
+
     def connect(self) -> bool:
         """
         Connect to the first available SpaceMouse device
         Returns:
             bool: True if connection successful, False otherwise
         """
-        try:
-            if self.connected:
-                self.disconnect()
-            devices = self.list_unique_devices()
-            if not devices:
-                logger.error("No SpaceMouse devices found")
-                return False
-            logger.info(f"Found unique devices: {devices}")
-            # pyspacemouse.open() always connects to the first available device
-            success = pyspacemouse.open()
-            if success:
-                self.connected = True
-                self.device = devices[0]
-                logger.info(f"Connected to device: {self.device}")
-                self.start_listening()
-                return True
-            else:
-                logger.error("Failed to connect to SpaceMouse")
+        with self._conn_lock:
+            try:
+                if self.connected:
+                    self.disconnect()
+                devices = self.list_unique_devices()
+                if not devices:
+                    logger.error("No SpaceMouse devices found")
+                    return False
+                logger.info(f"Found unique devices: {devices}")
+                # pyspacemouse.open() always connects to the first available device
+                success = pyspacemouse.open()
+                if success:
+                    self._device_spec = success
+                    # Resolved once here instead of on every read
+                    self._hid_device = getattr(success, 'device', None) if hasattr(success, 'process') else None
+                    self.connected = True
+                    self.device = devices[0]
+                    logger.info(f"Connected to device: {self.device}")
+                    self.start_listening()
+                    return True
+                else:
+                    logger.error("Failed to connect to SpaceMouse")
+                    return False
+            except Exception as e:
+                logger.error(f"Error connecting to SpaceMouse: {e}")
                 return False
-        except Exception as e:
-            logger.error(f"Error connecting to SpaceMouse: {e}")
-            return False
 
     def disconnect(self):
         """
         Disconnect from the SpaceMouse device
         """
-        self.running = False
-        if self.thread and self.thread != threading.current_thread():
-            self.thread.join()
-        self.connected = False
-        self.device = None
-        try:
-            pyspacemouse.close()
-        except Exception as e:
-            logger.error(f"Error disconnecting from SpaceMouse: {e}")
+        with self._conn_lock:
+            self._stop.set()
+            if self.thread and self.thread != threading.current_thread():
+                self.thread.join(timeout=0.5)
+            self.connected = False
+            self.device = None
+            self._device_spec = None
+            self._hid_device = None
+            try:
+                pyspacemouse.close()
+            except Exception as e:
+                logger.error(f"Error disconnecting from SpaceMouse: {e}")
 
     def start_listening(self):
         """
         Start listening for SpaceMouse input in a separate thread
         """
-        self.running = True
-        self.thread = threading.Thread(target=self._input_loop)
+        stop = threading.Event()
+        self._stop = stop
+        self.thread = threading.Thread(target=self._input_loop, args=(stop,))
         self.thread.daemon = True
         self.thread.start()
 
-    def _input_loop(self):
+    def _input_loop(self, stop: threading.Event):
         """
         Main input loop for SpaceMouse data
+        
+        Args:
+            stop: Event that stops this thread, owned by it alone
         """
+        self._apply_thread_priority(threading.get_native_id())
         retry_count = 0
         max_retries = 3
-        last_error_time = 0
+        last_error_time = 0.0
         error_cooldown = 1.0  # 1 second between error logs
+        # Hot loop: bind attribute and global lookups to locals once
+        read_state = self._read_state
+        buf = self._state_buf
+        payload = self._payload
+        monotonic = time.monotonic
         
-        while self.running:
+        while not stop.is_set():
+            error = None
             try:
-                state = pyspacemouse.read()
-                if state:
-                    retry_count = 0  # Reset retry count on successful read
-                    self.current_state = {
-                        'x': state.x,
-                        'y': state.y,
-                        'z': state.z,
-                        'roll': state.roll,
-                        'pitch': state.pitch,
-                        'yaw': state.yaw,
-                        'buttons': state.buttons
-                    }
-                    if self.callback:
-                        self.callback(self.current_state)
-                time.sleep(0.005)  # 200Hz polling rate
-                
+                state = read_state(stop)
             except Exception as e:
-                current_time = time.time()
-                retry_count += 1
-                
-                # Only log error if enough time has passed since last error
-                if current_time - last_error_time >= error_cooldown:
-                    logger.error(f"Error reading SpaceMouse input: {e}")
-                    last_error_time = current_time
-                
+                if stop.is_set():
+                    return  # Device closed by disconnect()
                 # Direct disconnect detection for USB unplug
-                if "Failed to read from HID device" in str(e):
+                if _is_disconnect_error(e):
                     logger.error("SpaceMouse disconnected (USB unplugged)")
                     self.connected = False
                     self.device = None
+                    self.invalidate_device_cache()
+                    self._hid_device = None
                     try:
                         pyspacemouse.close()
-                    except:
+                    except Exception:
                         pass
                     if self.on_disconnect:
                         time.sleep(0.1)  # Small delay for GUI
                         self.on_disconnect()
-                    self.running = False
+                    stop.set()
                     return  # Stop the thread
-                
-                if retry_count >= max_retries:
-                    logger.error("Max retries reached, attempting to reconnect...")
+                error = e
+                state = None
+
+            if state:
+                retry_count = 0  # Reset retry count on successful read
+                self._state_gen += 1
+                buf[0] = state.x
+                buf[1] = state.y
+                buf[2] = state.z
+                buf[3] = state.roll
+                buf[4] = state.pitch
+                buf[5] = state.yaw
+                self._buttons_buf = state.buttons
+                self._state_gen += 1
+                callback = self.callback
+                if callback:
+                    payload['x'] = state.x
+                    payload['y'] = state.y
+                    payload['z'] = state.z
+                    payload['roll'] = state.roll
+                    payload['pitch'] = state.pitch
+                    payload['yaw'] = state.yaw
+                    payload['buttons'] = state.buttons
+                    try:
+                        callback(payload)
+                    except Exception as e:
+                        current_time = monotonic()
+                        if current_time - last_error_time >= error_cooldown:
+                            logger.error(f"Error in SpaceMouse callback: {e}")
+                            last_error_time = current_time
+                continue
+
+            # Read failed, or the device is no longer open
+            retry_count += 1
+            current_time = monotonic()
+            # Only log error if enough time has passed since last error
+            if current_time - last_error_time >= error_cooldown and logger.isEnabledFor(logging.ERROR):
+                if error is not None:
+                    logger.error(f"Error reading SpaceMouse input: {error}")
+                else:
+                    logger.error("No state read from SpaceMouse")
+                last_error_time = current_time
+
+            if retry_count >= max_retries:
+                logger.error("Max retries reached, attempting to reconnect...")
+                # A connect() or disconnect() from the GUI takes over; it stops this thread
+                if not self._conn_lock.acquire(blocking=False):
+                    return
+                try:
+                    if stop.is_set():
+                        return
                     self.connected = False
                     self.device = None
+                    self.invalidate_device_cache()
+                    self._hid_device = None
                     try:
                         pyspacemouse.close()
-                    except:
+                    except Exception:
                         pass
                     if self.connect():
-                        retry_count = 0
-                    else:
-                        if self.on_disconnect:
-                            time.sleep(0.1)  # Small delay for GUI
-                            self.on_disconnect()
-                        time.sleep(1)  # Wait before retrying connection
-                else:
-                    time.sleep(0.1)  # Short wait before retry
+                        return  # connect() started a new input thread
+                finally:
+                    self._conn_lock.release()
+                if self.on_disconnect:
+                    time.sleep(0.1)  # Small delay for GUI
+                    self.on_disconnect()
+                stop.wait(1)  # Wait before retrying connection
+            else:
+                stop.wait(0.1)  # Short wait before retry
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether the input thread is (supposed to be) running
+        """
+        return not self._stop.is_set()
+
+    def _apply_thread_priority(self, thread_id: int):
+        """
+        Apply thread_priority and the CPU affinity to an OS thread (Windows only)
+        
+        Args:
+            thread_id: Native id of the thread
+        """
+        if _kernel32 is None:
+            return
+        handle = _kernel32.OpenThread(_THREAD_SET_INFORMATION | _THREAD_QUERY_INFORMATION, False, thread_id)
+        if not handle:
+            logger.warning(f"Could not open input thread to set its priority: {ctypes.get_last_error()}")
+            return
+        try:
+            if not _kernel32.SetThreadPriority(handle, self.thread_priority):
+                logger.warning(f"Could not set input thread priority: {ctypes.get_last_error()}")
+            if (os.cpu_count() or 1) > 1:
+                if not _kernel32.SetThreadAffinityMask(handle, INPUT_THREAD_AFFINITY):
+                    logger.warning(f"Could not set input thread affinity: {ctypes.get_last_error()}")
+        finally:
+            _kernel32.CloseHandle(handle)
+
+    def set_thread_priority(self, level: int):
+        """
+        Set the OS priority of the input thread
+        
+        Lower it (e.g. THREAD_PRIORITY_ABOVE_NORMAL) if the UI feels starved.
+        
+        Args:
+            level (int): Win32 thread priority level
+        """
+        self.thread_priority = level
+        if self.thread and self.thread.is_alive():
+            self._apply_thread_priority(self.thread.native_id)
+
+    def _read_state(self, stop: threading.Event):
+        """
+        Read the SpaceMouse state, blocking until a HID report arrives or the read times out
+        
+        Args:
+            stop: Stop event of the calling input thread
+        
+        Returns:
+            The current state, or None if the device is not open. On a timeout the
+            unchanged state is returned so time based consumers (prone hold) keep ticking.
+        """
+        hid_device = self._hid_device
+        if hid_device is None:
+            # No access to the underlying HID device: poll pyspacemouse at 200Hz,
+            # each read consumes one queued report so keep reading until nothing new arrives.
+            # read() builds a new tuple every call, so compare by value
+            state = pyspacemouse.read()
+            for _ in range(MAX_DRAIN_REPORTS):
+                if state is None:
+                    break
+                newer = pyspacemouse.read()
+                if newer == state:
+                    break
+                state = newer
+            stop.wait(0.005)
+            return state
+        spec = self._device_spec
+        data = hid_device.read(HID_REPORT_SIZE, READ_TIMEOUT_MS)
+        # Drain the reports queued behind it so the caller only gets the newest state.
+        # Every report is still decoded: translation, rotation and buttons arrive separately.
+        if data:
+            spec.process(data)
+            for _ in range(MAX_DRAIN_REPORTS):
+                data = hid_device.read(HID_REPORT_SIZE, 0)
+                if not data:
+                    break
+                spec.process(data)
+        return spec.tuple_state
 
     def set_callback(self, callback):
         """
         Set the callback function for SpaceMouse updates
         
+        The state dict passed to the callback is reused for every update, so the
+        callback must not keep a reference to it; copy it to retain a snapshot.
+        
         Args:
             callback: Function to call with SpaceMouse state updates
         """
@@ -210,9 +432,33 @@ class SpaceMouseController:
         """
         self.on_disconnect = callback
 
+    @property
+    def current_state(self) -> dict:
+        """
+        Consistent snapshot of the latest SpaceMouse state
+        
+        Returns:
+            dict: x, y, z, roll, pitch, yaw and buttons
+        """
+        while True:
+            gen = self._state_gen
+            x, y, z, roll, pitch, yaw = self._state_buf
+            buttons = self._buttons_buf
+            if gen == self._state_gen and not gen & 1:
+                break
+        return {
+            'x': x,
+            'y': y,
+            'z': z,
+            'roll': roll,
+            'pitch': pitch,
+            'yaw': yaw,
+            'buttons': buttons
+        }
+
     def get_movement(self) -> Tuple[float, float, float]:
         """
-        Get the current movement values
+        Get the current movement values, with sensitivity and deadzone applied
         
         Returns:
             Tuple[float, float, float]: (x, y, z) movement values
@@ -220,14 +466,26 @@ class SpaceMouseController:
         if not self.connected:
             return (0.0, 0.0, 0.0)
             
-        x = self.current_state['x'] * self.sensitivity
-        y = self.current_state['y'] * self.sensitivity
-        z = self.current_state['z'] * self.sensitivity
+        while True:
+            gen = self._state_gen
+            buf = self._state_buf
+            x, y, z = buf[0], buf[1], buf[2]
+            if gen == self._state_gen and not gen & 1:
+                break
+        x *= self.sensitivity
+        y *= self.sensitivity
+        z *= self.sensitivity
         
-        # Apply deadzone
-        x = 0.0 if abs(x) < self.deadzone else x
-        y = 0.0 if abs(y) < self.deadzone else y
-        z = 0.0 if abs(z) < self.deadzone else z
+        # Apply a radial deadzone to x/y, rescaled so movement ramps up from 0 at its edge
+        deadzone = self.deadzone
+        r = math.hypot(x, y)
+        if r <= deadzone:
+            x = y = 0.0
+        else:
+            scale = (r - deadzone) / ((1.0 - deadzone) * r)
+            x *= scale
+            y *= scale
+        z = 0.0 if abs(z) < deadzone else z
         
         return (x, y, z)
 
@@ -238,7 +496,7 @@ class SpaceMouseController:
         Returns:
             list: List of pressed button indices
         """
-        return self.current_state['buttons']
+        return self._buttons_buf
 
     def set_sensitivity(self, value: float):
         """
@@ -9,27 +9,69 @@ from PyQt6.QtWidgets import (
     QLabel, QSlider, QPushButton, QGroupBox,
     QComboBox, QStatusBar, QMessageBox, QCheckBox, QFileDialog, QInputDialog
 )
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QObject
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QObject, QStringListModel, QSignalBlocker
 from PyQt6.QtGui import QIcon, QPixmap
+from contextlib import ExitStack
 from typing import Dict, Any
 import logging
 import os
 import json
-import psutil
+import shutil
 import sys
+import time
+
+try:
+    # Faster JSON parser/serializer, used for profiles when installed
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps_profile(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+def _loads_profile(blob: bytes):
+    if orjson is not None:
+        return orjson.loads(blob)
+    return json.loads(blob)
 
 logger = logging.getLogger(__name__)
 
+# Process lookup modules, imported on first use by _load_process_modules
+_psutil = None
+_win32gui = None
+_win32process = None
+
+def _load_process_modules():
+    global _psutil, _win32gui, _win32process
+    if _psutil is None:
+        import psutil, win32gui, win32process
+        _win32gui, _win32process = win32gui, win32process
+        _psutil = psutil
+
+FG_PROC_CACHE_TTL = 60.0  # Seconds before an unused foreground process entry is dropped
+SLIDER_DEBOUNCE_MS = 16  # Quiet time before a dragged slider value is applied
+MOVEMENT_TEXT = "Movement: X: {:.2f} Y: {:.2f} Z: {:.2f}"
+BUTTONS_TEXT = "Buttons: {}"
+
+# Keys that can be bound; the set is for validating keys from profile files
+ALL_KEYS = (
+    'a','b','c','d','e','f','g','h','i','j','k','l','m','n','o','p','q','r','s','t','u','v','w','x','y','z',
+    '0','1','2','3','4','5','6','7','8','9',
+    'space','shift','ctrl','alt','tab','capslock','esc','enter','backspace','delete','insert','home','end','pageup','pagedown','up','down','left','right',
+    'f1','f2','f3','f4','f5','f6','f7','f8','f9','f10','f11','f12'
+)
+ALL_KEYS_SET = frozenset(ALL_KEYS)
+
 class DisconnectHandler(QObject):
     disconnected = pyqtSignal()
 
+class StatusHandler(QObject):
+    updated = pyqtSignal()
+
 class MainWindow(QMainWindow):
-    ALL_KEYS = [
-        'a','b','c','d','e','f','g','h','i','j','k','l','m','n','o','p','q','r','s','t','u','v','w','x','y','z',
-        '0','1','2','3','4','5','6','7','8','9',
-        'space','shift','ctrl','alt','tab','capslock','esc','enter','backspace','delete','insert','home','end','pageup','pagedown','up','down','left','right',
-        'f1','f2','f3','f4','f5','f6','f7','f8','f9','f10','f11','f12'
-    ]
+    ALL_KEYS = ALL_KEYS
     PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../profiles')
     def __init__(self, spacemouse, keyboard):
         """
@@ -62,8 +104,7 @@ class MainWindow(QMainWindow):
         
         # Voeg het logo toe bovenaan
         logo_label = QLabel()
-        logo_pixmap = QPixmap(self.resource_path('assets/icons/Spacemouse_keyboard.png'))
-        logo_label.setPixmap(logo_pixmap.scaledToWidth(175, Qt.TransformationMode.SmoothTransformation))
+        logo_label.setPixmap(self._logo_pixmap(175))
         logo_label.setAlignment(Qt.AlignmentFlag.AlignHCenter)
         layout.addWidget(logo_label)
         
@@ -71,6 +112,20 @@ class MainWindow(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         
+        # One key list model shared by every keybind combo
+        self._keys_model = QStringListModel(list(self.ALL_KEYS), self)
+        
+        # Slider values reach the controllers once a drag pauses; labels follow every tick
+        self._apply_timers = {
+            'sensitivity': self._debounce(lambda: self.spacemouse.set_sensitivity(self.sensitivity_slider.value() / 100.0)),
+            'deadzone': self._debounce(lambda: self.spacemouse.set_deadzone(self.deadzone_slider.value() / 100.0)),
+            'threshold': self._debounce(lambda: self.keyboard.set_movement_threshold(self.threshold_slider.value() / 100.0)),
+            'jump_threshold': self._debounce(lambda: self.keyboard.set_jump_threshold(self.jump_threshold_slider.value() / 100.0)),
+            'crouch_threshold': self._debounce(lambda: self.keyboard.set_crouch_threshold(self.crouch_threshold_slider.value() / 100.0)),
+            'sprint_threshold': self._debounce(lambda: self.keyboard.set_sprint_threshold(self.sprint_threshold_slider.value() / 100.0)),
+            'prone_duration': self._debounce(lambda: self.keyboard.set_prone_duration(self.prone_duration_slider.value() / 10.0)),
+        }
+        
         # Create control sections
         self._create_connection_section(layout)
         self._create_sensitivity_section(layout)
@@ -78,21 +133,32 @@ class MainWindow(QMainWindow):
         self._create_status_section(layout)
         self.current_profile = 'default'
         self.profile_process_map = {}
+        self._profile_cache = {}  # name -> (mtime, parsed profile)
+        self._profiles_dirty = True  # Profile files changed since the combo was filled
+        self._profile_index = {}  # profile name -> combo index
+        self._profile_by_proc_lower = {}  # lowercased process name -> profile
+        self._fg_proc_cache = {}  # pid -> (psutil.Process, last seen)
+        self._last_hwnd = None
+        self._hwnd_name_cache = {}  # hwnd -> process name
         self._create_profile_section(layout)
         
-        # Set up update timer
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self._update_status)
-        self.update_timer.start(100)  # Update every 100ms
+        # Status display is refreshed from the SpaceMouse callback, only when something changed
+        self._last_status = None
+        self._shown_status = None
+        self.status_handler = StatusHandler()
+        self.status_handler.updated.connect(self._refresh_visuals)
         
         # Initial device scan
         self._scan_devices()
         # Probeer direct te verbinden
         self._connect_spacemouse()
         
+        # Coarse timer: profile switching does not need precise wakeups.
+        # It only runs while a profile is linked to a process, see _rebuild_process_index
         self.process_timer = QTimer()
+        self.process_timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self.process_timer.setInterval(3000)
         self.process_timer.timeout.connect(self._auto_profile_switch)
-        self.process_timer.start(2000)
 
         # Set the disconnect callback
         self.spacemouse.set_on_disconnect(self.disconnect_handler.disconnected.emit)
@@ -132,18 +198,21 @@ class MainWindow(QMainWindow):
         
         # Refresh button
         refresh_button = QPushButton("Refresh Devices")
-        refresh_button.clicked.connect(self._scan_devices)
+        refresh_button.clicked.connect(lambda: self._scan_devices(refresh=True))
         layout.addWidget(refresh_button)
         
         group.setLayout(layout)
         parent_layout.addWidget(group)
 
-    def _scan_devices(self):
+    def _scan_devices(self, refresh=False):
         """
         Scan for available SpaceMouse devices (unique names only)
+        
+        Args:
+            refresh: Enumerate the devices again instead of using the cached list
         """
         self.device_combo.clear()
-        devices = self.spacemouse.list_unique_devices()
+        devices = self.spacemouse.list_unique_devices(refresh=refresh)
         if devices:
             self.device_combo.addItems(devices)
             self.status_bar.showMessage(f"Found {len(devices)} unique device(s)")
@@ -259,7 +328,7 @@ class MainWindow(QMainWindow):
         sprint_layout = QHBoxLayout()
         sprint_layout.addWidget(QLabel("Sprint key:"))
         self.sprint_combo = QComboBox()
-        self.sprint_combo.addItems(self.ALL_KEYS)
+        self.sprint_combo.setModel(self._keys_model)
         self.sprint_combo.setCurrentText('shift')
         self.sprint_combo.currentTextChanged.connect(self._update_sprint_key)
         sprint_layout.addWidget(self.sprint_combo)
@@ -284,7 +353,7 @@ class MainWindow(QMainWindow):
         jump_layout = QHBoxLayout()
         jump_layout.addWidget(QLabel("Jump (pull up):"))
         self.jump_combo = QComboBox()
-        self.jump_combo.addItems(self.ALL_KEYS)
+        self.jump_combo.setModel(self._keys_model)
         self.jump_combo.setCurrentText('space')
         self.jump_combo.currentTextChanged.connect(self._update_jump_key)
         jump_layout.addWidget(self.jump_combo)
@@ -303,7 +372,7 @@ class MainWindow(QMainWindow):
         crouch_layout = QHBoxLayout()
         crouch_layout.addWidget(QLabel("Crouch (push down):"))
         self.crouch_combo = QComboBox()
-        self.crouch_combo.addItems(self.ALL_KEYS)
+        self.crouch_combo.setModel(self._keys_model)
         self.crouch_combo.setCurrentText('c')
         self.crouch_combo.currentTextChanged.connect(self._update_crouch_key)
         crouch_layout.addWidget(self.crouch_combo)
@@ -321,7 +390,7 @@ class MainWindow(QMainWindow):
         prone_layout = QHBoxLayout()
         prone_layout.addWidget(QLabel("Prone key:"))
         self.prone_combo = QComboBox()
-        self.prone_combo.addItems(self.ALL_KEYS)
+        self.prone_combo.setModel(self._keys_model)
         self.prone_combo.setCurrentText('x')
         self.prone_combo.currentTextChanged.connect(self._update_prone_key)
         prone_layout.addWidget(self.prone_combo)
@@ -350,7 +419,7 @@ class MainWindow(QMainWindow):
         layout = QVBoxLayout()
         
         # Movement values
-        self.movement_label = QLabel("Movement: X: 0.00 Y: 0.00 Z: 0.00")
+        self.movement_label = QLabel(MOVEMENT_TEXT.format(0.0, 0.0, 0.0))
         layout.addWidget(self.movement_label)
         
         # Button states
@@ -361,7 +430,7 @@ class MainWindow(QMainWindow):
         button1_layout = QHBoxLayout()
         button1_layout.addWidget(QLabel("Button 1 keybind:"))
         self.button1_combo = QComboBox()
-        self.button1_combo.addItems(self.ALL_KEYS)
+        self.button1_combo.setModel(self._keys_model)
         self.button1_combo.setCurrentText('1')
         self.button1_combo.currentTextChanged.connect(self._update_button1_key)
         button1_layout.addWidget(self.button1_combo)
@@ -369,7 +438,7 @@ class MainWindow(QMainWindow):
         button2_layout = QHBoxLayout()
         button2_layout.addWidget(QLabel("Button 2 keybind:"))
         self.button2_combo = QComboBox()
-        self.button2_combo.addItems(self.ALL_KEYS)
+        self.button2_combo.setModel(self._keys_model)
         self.button2_combo.setCurrentText('2')
         self.button2_combo.currentTextChanged.connect(self._update_button2_key)
         button2_layout.addWidget(self.button2_combo)
@@ -416,21 +485,45 @@ class MainWindow(QMainWindow):
         return os.path.join(self.PROFILE_DIR, f"{name}.json")
 
     def _refresh_profiles(self):
+        if not self._profiles_dirty:
+            index = self._profile_index.get(self.current_profile)
+            if index is not None:
+                if index != self.profile_combo.currentIndex():
+                    with QSignalBlocker(self.profile_combo):
+                        self.profile_combo.setCurrentIndex(index)
+                return
+            # Not in the list yet (file added outside the app), rescan below
+        self._profiles_dirty = False
         if not os.path.exists(self.PROFILE_DIR):
             os.makedirs(self.PROFILE_DIR)
-        self.profile_combo.blockSignals(True)
-        self.profile_combo.clear()
-        profiles = [f[:-5] for f in os.listdir(self.PROFILE_DIR) if f.endswith('.json')]
+        with os.scandir(self.PROFILE_DIR) as it:
+            profiles = [e.name[:-5] for e in it if e.name.endswith('.json') and e.is_file()]
         if 'default' not in profiles:
             profiles.insert(0, 'default')
-        self.profile_combo.addItems(profiles)
-        self.profile_combo.setCurrentText(self.current_profile)
-        self.profile_combo.blockSignals(False)
+        self._profile_index = {name: i for i, name in enumerate(profiles)}
+        with QSignalBlocker(self.profile_combo):
+            self.profile_combo.clear()
+            self.profile_combo.addItems(profiles)
+            self.profile_combo.setCurrentIndex(self._profile_index.get(self.current_profile, 0))
 
     def _save_current_profile(self):
+        self._rebuild_process_index()
         data = self._gather_profile_data()
-        with open(self._profile_path(self.current_profile), 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        blob = _dumps_profile(data)
+        path = self._profile_path(self.current_profile)
+        # Write next to the profile and swap it in, so a failed save never leaves half a file
+        tmp_path = path + '.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            view = memoryview(blob)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+        # The saved file is what the next load would read; parse a detached copy for the cache
+        self._profile_cache[self.current_profile] = (os.stat(path).st_mtime_ns, _loads_profile(blob))
+        self._profiles_dirty = True
         self._refresh_profiles()
 
     def _gather_profile_data(self):
@@ -450,44 +543,94 @@ class MainWindow(QMainWindow):
             'profile_process_map': self.profile_process_map,
         }
 
-    def _load_profile(self, name):
+    def _read_profile(self, name):
+        # Parsed profile data, re-read only when the file changed on disk
         path = self._profile_path(name)
-        if not os.path.exists(path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            self._profile_cache.pop(name, None)
+            return None
+        cached = self._profile_cache.get(name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'rb') as f:
+            data = _loads_profile(f.read())
+        self._profile_cache[name] = (mtime, data)
+        return data
+
+    def _load_profile(self, name):
+        data = self._read_profile(name)
+        if data is None:
             return
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        self.keyboard.movement_keys = data.get('movement_keys', self.keyboard.movement_keys)
-        self.keyboard.jump_key = data.get('jump_key', self.keyboard.jump_key)
-        self.keyboard.crouch_key = data.get('crouch_key', self.keyboard.crouch_key)
-        self.keyboard.sprint_key = data.get('sprint_key', self.keyboard.sprint_key)
-        self.keyboard.prone_key = data.get('prone_key', self.keyboard.prone_key)
-        self.keyboard.movement_threshold = data.get('movement_threshold', self.keyboard.movement_threshold)
-        self.keyboard.jump_threshold = data.get('jump_threshold', self.keyboard.jump_threshold)
-        self.keyboard.crouch_threshold = data.get('crouch_threshold', self.keyboard.crouch_threshold)
-        self.keyboard.sprint_threshold = data.get('sprint_threshold', self.keyboard.sprint_threshold)
-        self.keyboard.sprint_enabled = data.get('sprint_enabled', self.keyboard.sprint_enabled)
-        self.keyboard.prone_duration = data.get('prone_duration', self.keyboard.prone_duration)
-        self.keyboard.button_keys = data.get('button_keys', self.keyboard.button_keys)
-        self.profile_process_map = data.get('profile_process_map', self.profile_process_map)
+        for action, key in data.get('movement_keys', {}).items():
+            self.keyboard.set_movement_key(action, self._valid_key(key, self.keyboard.movement_keys.get(action)))
+        self.keyboard.set_jump_key(self._valid_key(data.get('jump_key'), self.keyboard.jump_key))
+        self.keyboard.set_crouch_key(self._valid_key(data.get('crouch_key'), self.keyboard.crouch_key))
+        self.keyboard.set_sprint_key(self._valid_key(data.get('sprint_key'), self.keyboard.sprint_key))
+        self.keyboard.set_prone_key(self._valid_key(data.get('prone_key'), self.keyboard.prone_key))
+        self.keyboard.set_movement_threshold(data.get('movement_threshold', self.keyboard.movement_threshold))
+        self.keyboard.set_jump_threshold(data.get('jump_threshold', self.keyboard.jump_threshold))
+        self.keyboard.set_crouch_threshold(data.get('crouch_threshold', self.keyboard.crouch_threshold))
+        self.keyboard.set_sprint_threshold(data.get('sprint_threshold', self.keyboard.sprint_threshold))
+        self.keyboard.set_sprint_enabled(data.get('sprint_enabled', self.keyboard.sprint_enabled))
+        self.keyboard.set_prone_duration(data.get('prone_duration', self.keyboard.prone_duration))
+        for index, key in enumerate(data.get('button_keys', [])):
+            current = self.keyboard.button_keys[index] if index < len(self.keyboard.button_keys) else str(index + 1)
+            self.keyboard.set_button_key(index, self._valid_key(key, current))
+        # Copy, so later edits do not leak into the cached profile
+        self.profile_process_map = dict(data.get('profile_process_map', self.profile_process_map))
+        self._rebuild_process_index()
         self.current_profile = name
         self._refresh_profiles()
         self._update_gui_from_profile()
 
+    def _valid_key(self, key, current):
+        # Keep the current key when a profile has a missing or unknown one
+        if key is None:
+            return current
+        if not isinstance(key, str) or key.lower() not in ALL_KEYS_SET:
+            logger.warning(f"Ignoring unknown key in profile: {key!r}")
+            return current
+        return key
+
     def _update_gui_from_profile(self):
         # Zet alle GUI-controls naar de waarden van het geladen profiel
-        self.sprint_combo.setCurrentText(self.keyboard.sprint_key)
-        self.sprint_checkbox.setChecked(self.keyboard.sprint_enabled)
-        self.sprint_threshold_slider.setValue(int(self.keyboard.sprint_threshold * 100))
-        self.jump_combo.setCurrentText(self.keyboard.jump_key)
-        self.jump_threshold_slider.setValue(int(self.keyboard.jump_threshold * 100))
-        self.crouch_combo.setCurrentText(self.keyboard.crouch_key)
-        self.crouch_threshold_slider.setValue(int(self.keyboard.crouch_threshold * 100))
-        self.prone_combo.setCurrentText(self.keyboard.prone_key)
-        self.prone_duration_slider.setValue(int(self.keyboard.prone_duration * 10))
-        self.button1_combo.setCurrentText(self.keyboard.button_keys[0])
-        self.button2_combo.setCurrentText(self.keyboard.button_keys[1])
-        self.threshold_slider.setValue(int(self.keyboard.movement_threshold * 100))
-        # ... eventueel meer GUI-controls ...
+        # The keyboard already has these values, so the change handlers stay silent
+        # and the whole update is painted once
+        widgets = (
+            self.sprint_combo, self.sprint_checkbox, self.sprint_threshold_slider,
+            self.jump_combo, self.jump_threshold_slider,
+            self.crouch_combo, self.crouch_threshold_slider,
+            self.prone_combo, self.prone_duration_slider,
+            self.button1_combo, self.button2_combo, self.threshold_slider,
+        )
+        central = self.centralWidget()
+        central.setUpdatesEnabled(False)
+        try:
+            with ExitStack() as blockers:
+                for widget in widgets:
+                    blockers.enter_context(QSignalBlocker(widget))
+                self.sprint_combo.setCurrentText(self.keyboard.sprint_key)
+                self.sprint_checkbox.setChecked(self.keyboard.sprint_enabled)
+                self.sprint_threshold_slider.setValue(int(self.keyboard.sprint_threshold * 100))
+                self.sprint_threshold_value.setText(f"{self.keyboard.sprint_threshold:.2f}")
+                self.jump_combo.setCurrentText(self.keyboard.jump_key)
+                self.jump_threshold_slider.setValue(int(self.keyboard.jump_threshold * 100))
+                self.jump_threshold_value.setText(f"{self.keyboard.jump_threshold:.2f}")
+                self.crouch_combo.setCurrentText(self.keyboard.crouch_key)
+                self.crouch_threshold_slider.setValue(int(self.keyboard.crouch_threshold * 100))
+                self.crouch_threshold_value.setText(f"{self.keyboard.crouch_threshold:.2f}")
+                self.prone_combo.setCurrentText(self.keyboard.prone_key)
+                self.prone_duration_slider.setValue(int(self.keyboard.prone_duration * 10))
+                self.prone_duration_value.setText(f"{self.keyboard.prone_duration:.2f}")
+                self.button1_combo.setCurrentText(self.keyboard.button_keys[0])
+                self.button2_combo.setCurrentText(self.keyboard.button_keys[1])
+                self.threshold_slider.setValue(int(self.keyboard.movement_threshold * 100))
+                self.threshold_value.setText(f"{self.keyboard.movement_threshold:.2f}")
+                # ... eventueel meer GUI-controls ...
+        finally:
+            central.setUpdatesEnabled(True)
 
     def _on_profile_selected(self, name):
         self._load_profile(name)
@@ -498,6 +641,7 @@ class MainWindow(QMainWindow):
         if ok and new and new != old:
             os.rename(self._profile_path(old), self._profile_path(new))
             self.current_profile = new
+            self._profiles_dirty = True
             self._refresh_profiles()
 
     def _delete_profile(self):
@@ -506,50 +650,90 @@ class MainWindow(QMainWindow):
             return
         os.remove(self._profile_path(self.current_profile))
         self.current_profile = 'default'
+        self._profiles_dirty = True
         self._refresh_profiles()
         self._load_profile('default')
 
     def _export_profile(self):
         path, _ = QFileDialog.getSaveFileName(self, "Export Profile", "profile.json", "JSON Files (*.json)")
         if path:
-            with open(self._profile_path(self.current_profile), 'r', encoding='utf-8') as src, open(path, 'w', encoding='utf-8') as dst:
-                dst.write(src.read())
+            shutil.copyfile(self._profile_path(self.current_profile), path)
 
     def _import_profile(self):
         path, _ = QFileDialog.getOpenFileName(self, "Import Profile", "", "JSON Files (*.json)")
         if path:
             name, ok = QInputDialog.getText(self, "Profile Name", "Name for imported profile:")
             if ok and name:
-                with open(path, 'r', encoding='utf-8') as src, open(self._profile_path(name), 'w', encoding='utf-8') as dst:
-                    dst.write(src.read())
+                shutil.copyfile(path, self._profile_path(name))
+                self._profiles_dirty = True
                 self._refresh_profiles()
 
     def _link_profile_to_process(self):
         name, ok = QInputDialog.getText(self, "Link Profile to Process", "Process name (bijv. game.exe):")
         if ok and name:
             self.profile_process_map[self.current_profile] = name
+            self._rebuild_process_index()
             self._save_current_profile()
+            self._last_hwnd = None  # Re-check the foreground window against the new link
 
     def _auto_profile_switch(self):
         # Detecteer actief proces en laad profiel indien gekoppeld
+        if not self._profile_by_proc_lower:
+            return  # No profile is linked, nothing to switch to
         try:
-            active = self._get_active_process_name()
-            for prof, proc in self.profile_process_map.items():
-                if proc and proc.lower() == active.lower() and prof != self.current_profile:
-                    self._load_profile(prof)
-                    break
+            _load_process_modules()
+            hwnd = _win32gui.GetForegroundWindow()
+            if hwnd == self._last_hwnd:
+                return  # Same window as last tick
+            self._last_hwnd = hwnd
+            active = self._hwnd_name_cache.get(hwnd)
+            if active is None:
+                active = self._get_active_process_name(hwnd)
+                if active:
+                    # Drop windows that have been closed since
+                    for old_hwnd in [h for h in self._hwnd_name_cache if not _win32gui.IsWindow(h)]:
+                        del self._hwnd_name_cache[old_hwnd]
+                    self._hwnd_name_cache[hwnd] = active
+            prof = self._profile_by_proc_lower.get(active.lower())
+            if prof and prof != self.current_profile:
+                self._load_profile(prof)
         except Exception:
             pass
 
-    def _get_active_process_name(self):
+    def _rebuild_process_index(self):
+        # Lowercased process name -> profile, first linked profile wins like the old linear scan
+        index = {}
+        for prof, proc in self.profile_process_map.items():
+            if proc:
+                index.setdefault(proc.lower(), prof)
+        self._profile_by_proc_lower = index
+        if not index:
+            self.process_timer.stop()
+        elif not self.process_timer.isActive():
+            self._last_hwnd = None
+            self.process_timer.start()
+
+    def _get_active_process_name(self, hwnd=None):
         # Windows: krijg de naam van het actieve venster/proces
-        import win32gui, win32process
-        hwnd = win32gui.GetForegroundWindow()
-        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-        for p in psutil.process_iter(['pid', 'name']):
-            if p.info['pid'] == pid:
-                return p.info['name']
-        return ''
+        _load_process_modules()
+        if hwnd is None:
+            hwnd = _win32gui.GetForegroundWindow()
+        _, pid = _win32process.GetWindowThreadProcessId(hwnd)
+        cache = self._fg_proc_cache
+        entry = cache.get(pid)
+        try:
+            # is_running() also catches a reused PID
+            proc = entry[0] if entry is not None and entry[0].is_running() else _psutil.Process(pid)
+            with proc.oneshot():
+                name = proc.name()
+        except (_psutil.NoSuchProcess, _psutil.AccessDenied):
+            cache.pop(pid, None)
+            return ''
+        now = time.monotonic()
+        cache[pid] = (proc, now)
+        for old_pid in [p for p, (_, seen) in cache.items() if now - seen > FG_PROC_CACHE_TTL]:
+            del cache[old_pid]
+        return name
 
     def _spacemouse_callback(self, state: Dict[str, Any]):
         """
@@ -564,17 +748,16 @@ class MainWindow(QMainWindow):
         z = state['z']
         self.keyboard.update_movement(roll, pitch, z)
         # Update button keybinds
-        self.keyboard.update_buttons(state.get('buttons', []))
-        # Update status display
-        self.movement_label.setText(
-            f"Movement: Roll: {roll:.2f} Pitch: {pitch:.2f} Z: {z:.2f}"
-        )
-        # Update button display
-        buttons = state['buttons']
-        if buttons:
-            self.button_label.setText(f"Buttons: {', '.join(map(str, buttons))}")
-        else:
-            self.button_label.setText("Buttons: None")
+        buttons = state.get('buttons', [])
+        self.keyboard.update_buttons(buttons)
+        # Update status display in the main thread, but only when the shown text would change.
+        # The shown movement has sensitivity and deadzone applied and is compared in
+        # hundredths, the precision it is displayed with
+        mx, my, mz = self.spacemouse.get_movement()
+        status = (round(mx * 100), round(my * 100), round(mz * 100), tuple(buttons), self.keyboard.active_state)
+        if status != self._last_status:
+            self._last_status = status
+            self.status_handler.updated.emit()
 
     def _update_sensitivity(self, value: int):
         """
@@ -584,8 +767,8 @@ class MainWindow(QMainWindow):
             value: New sensitivity value (0-200)
         """
         sensitivity = value / 100.0
-        self.spacemouse.set_sensitivity(sensitivity)
         self.sensitivity_value.setText(f"{sensitivity:.2f}")
+        self._apply_timers['sensitivity'].start()
 
     def _update_deadzone(self, value: int):
         """
@@ -595,8 +778,8 @@ class MainWindow(QMainWindow):
             value: New deadzone value (0-50)
         """
         deadzone = value / 100.0
-        self.spacemouse.set_deadzone(deadzone)
         self.deadzone_value.setText(f"{deadzone:.2f}")
+        self._apply_timers['deadzone'].start()
 
     def _update_threshold(self, value: int):
         """
@@ -606,8 +789,8 @@ class MainWindow(QMainWindow):
             value: New threshold value (0-100)
         """
         threshold = value / 100.0
-        self.keyboard.set_movement_threshold(threshold)
         self.threshold_value.setText(f"{threshold:.2f}")
+        self._apply_timers['threshold'].start()
 
     def _update_jump_key(self, key: str):
         self.keyboard.set_jump_key(key)
@@ -617,13 +800,13 @@ class MainWindow(QMainWindow):
 
     def _update_jump_threshold(self, value: int):
         threshold = value / 100.0
-        self.keyboard.set_jump_threshold(threshold)
         self.jump_threshold_value.setText(f"{threshold:.2f}")
+        self._apply_timers['jump_threshold'].start()
 
     def _update_crouch_threshold(self, value: int):
         threshold = value / 100.0
-        self.keyboard.set_crouch_threshold(threshold)
         self.crouch_threshold_value.setText(f"{threshold:.2f}")
+        self._apply_timers['crouch_threshold'].start()
 
     def _update_button1_key(self, key: str):
         self.keyboard.set_button_key(0, key)
@@ -636,8 +819,8 @@ class MainWindow(QMainWindow):
 
     def _update_sprint_threshold(self, value: int):
         threshold = value / 100.0
-        self.keyboard.set_sprint_threshold(threshold)
         self.sprint_threshold_value.setText(f"{threshold:.2f}")
+        self._apply_timers['sprint_threshold'].start()
 
     def _update_sprint_enabled(self, state):
         enabled = state == 2
@@ -648,24 +831,39 @@ class MainWindow(QMainWindow):
 
     def _update_prone_duration(self, value: int):
         seconds = value / 10.0
-        self.keyboard.set_prone_duration(seconds)
         self.prone_duration_value.setText(f"{seconds:.2f}")
+        self._apply_timers['prone_duration'].start()
 
-    def _update_status(self):
+    def _debounce(self, apply):
         """
-        Update status display
+        Create a single-shot timer that runs apply once it stops being restarted
+        
+        Args:
+            apply: Callable that pushes the current slider value to a controller
         """
-        if self.spacemouse.connected:
-            x, y, z = self.spacemouse.get_movement()
-            self.movement_label.setText(
-                f"Movement: X: {x:.2f} Y: {y:.2f} Z: {z:.2f}"
-            )
-            
-            buttons = self.spacemouse.get_buttons()
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(SLIDER_DEBOUNCE_MS)
+        timer.timeout.connect(apply)
+        return timer
+
+    def _refresh_visuals(self):
+        """
+        Update status display from the last SpaceMouse state, skipping unchanged labels
+        """
+        status = self._last_status
+        shown = self._shown_status
+        if status is None or status == shown:
+            return
+        x, y, z, buttons, active = status  # Axes in hundredths
+        if shown is None or shown[:3] != status[:3]:
+            self.movement_label.setText(MOVEMENT_TEXT.format(x / 100, y / 100, z / 100))
+        if shown is None or shown[3] != buttons:
             if buttons:
-                self.button_label.setText(f"Buttons: {', '.join(map(str, buttons))}")
+                self.button_label.setText(BUTTONS_TEXT.format(', '.join(map(str, buttons))))
             else:
                 self.button_label.setText("Buttons: None")
+        if shown is None or shown[4] != active:
             # Visualisatie van actieve acties/keys
             actions = self.keyboard.active_actions
             vis = []
@@ -680,6 +878,7 @@ class MainWindow(QMainWindow):
             if not vis:
                 vis = ["-"]
             self.visual_label.setText("Active: " + ' | '.join(vis))
+        self._shown_status = status
 
     def closeEvent(self, event):
         """
@@ -706,6 +905,14 @@ class MainWindow(QMainWindow):
                 "The SpaceMouse has been disconnected or cannot reconnect. Please check the connection and try again."
             ) 
 
+    def _logo_pixmap(self, width):
+        """Logo at width, loaded from the pre-scaled asset when one is shipped for that width."""
+        pixmap = QPixmap(self.resource_path(f'assets/icons/Spacemouse_keyboard_{width}.png'))
+        if pixmap.isNull():
+            source = QPixmap(self.resource_path('assets/icons/Spacemouse_keyboard.png'))
+            pixmap = source.scaledToWidth(width, Qt.TransformationMode.SmoothTransformation)
+        return pixmap
+
     def resource_path(self, relative_path):
         """Get absolute path to resource, works for dev and for PyInstaller onefile."""
         if hasattr(sys, '_MEIPASS'):